@@ -22,11 +22,16 @@ from .core_path import (
     build_s_ease_curve_and_bake,
     build_linear_path_and_bake,
     restore_chassis_backup,               # exposes backup->restore used by Revert
+    violation_jump,                       # O(log n) next/prev violation from the scene's stored intervals
+    violation_intervals,
+    set_violation_markers,
+    clear_violation_markers,
 )
 
 # Code RPM + drivers + baking
 from .core_rpm import (
     build_cache,
+    verify_odometry,                      # dead-reckons driven θ with measured wheel geometry vs chassis
     attach_drivers,
     bake_wheels,
     clear_wheels,
@@ -51,15 +56,39 @@ class SG_OT_ValidateMotion(bpy.types.Operator):
         except Exception as e:
             self.report({'ERROR'}, str(e)); return {'CANCELLED'}
         if a.get('violations', 0) > 0:
-            frames = a.get('violation_frames', [])
-            head = ", ".join(str(f) for f in frames[:12]) + (" …" if len(frames)>12 else "")
+            iv = a.get('intervals', [])
+            set_violation_markers(context, iv)
+            head = ", ".join(f"{f0}–{f1} @{pk:.3f}" for f0, f1, pk in iv[:6]) + (" …" if len(iv)>6 else "")
             self.report({'ERROR'},
-                        f"This won't work: {a['violations']} step(s) exceed sideways tolerance > {a['side_tol']} (frames {head}).")
+                        f"This won't work: {a['violations']} step(s) in {len(iv)} stretch(es) exceed sideways tolerance > {a['side_tol']} (frames {head}).")
             return {'CANCELLED'}
+        clear_violation_markers(context)
         self.report({'INFO'}, "Motion is feasible (no slip violations).")
         return {'FINISHED'}
 
 
+class SG_OT_JumpViolation(bpy.types.Operator):
+    bl_idname = "segway.jump_violation"
+    bl_label  = "Jump to Violation"
+    bl_description = "Jump to the next/previous sideways-slip stretch found by Validate Motion"
+    forward: bpy.props.BoolProperty(name="Forward", default=True)
+    def execute(self, context):
+        f = violation_jump(context, 1 if self.forward else -1)
+        if f is None:
+            self.report({'WARNING'}, "No further violations (run Validate Motion first)."); return {'CANCELLED'}
+        context.scene.frame_set(f)
+        return {'FINISHED'}
+
+
+class SG_OT_ClearViolationMarkers(bpy.types.Operator):
+    bl_idname = "segway.clear_violation_markers"
+    bl_label  = "Clear Slip Markers"
+    def execute(self, context):
+        n = clear_violation_markers(context)
+        self.report({'INFO'}, f"Removed {n} slip marker(s).")
+        return {'FINISHED'}
+
+
 class SG_OT_AutocorrectBake(bpy.types.Operator):
     bl_idname = "segway.autocorrect_bake"
     bl_label  = "Autocorrect & Bake"
@@ -73,6 +102,7 @@ class SG_OT_AutocorrectBake(bpy.types.Operator):
                 self.report({'ERROR'}, "Set Autocorrect Mode to S-Ease or Linear."); return {'CANCELLED'}
         except Exception as e:
             self.report({'ERROR'}, f"Autocorrect failed: {e}"); return {'CANCELLED'}
+        clear_violation_markers(context)          # path changed; markers are stale until re-validated
         self.report({'INFO'}, f"Autocorrect baked {n} frames. Re-run Validate Motion.")
         return {'FINISHED'}
 
@@ -88,6 +118,7 @@ class SG_OT_AutocorrectSEase(bpy.types.Operator):
             n = build_s_ease_curve_and_bake(context)
         except Exception as e:
             self.report({'ERROR'}, f"Autocorrect failed: {e}"); return {'CANCELLED'}
+        clear_violation_markers(context)          # path changed; markers are stale until re-validated
         self.report({'INFO'}, f"Autocorrect baked {n} frames. Re-run Validate Motion.")
         return {'FINISHED'}
 
@@ -103,6 +134,7 @@ class SG_OT_AutocorrectLinear(bpy.types.Operator):
             n = build_linear_path_and_bake(context)
         except Exception as e:
             self.report({'ERROR'}, f"Autocorrect failed: {e}"); return {'CANCELLED'}
+        clear_violation_markers(context)          # path changed; markers are stale until re-validated
         self.report({'INFO'}, f"Linear autocorrect baked {n} frames. Re-run Validate Motion.")
         return {'FINISHED'}
 
@@ -117,6 +149,7 @@ class SG_OT_RevertAutocorrect(bpy.types.Operator):
             self.report({'ERROR'}, str(e)); return {'CANCELLED'}
         if not ok:
             self.report({'ERROR'}, "No backup found to restore."); return {'CANCELLED'}
+        clear_violation_markers(context)
         self.report({'INFO'}, "Original chassis keyframes restored.")
         return {'FINISHED'}
 
@@ -141,9 +174,25 @@ class SG_OT_BuildCache(bpy.types.Operator):
     def execute(self, context):
         try:
             d = build_cache(context)
+            o = verify_odometry(context, d)
         except Exception as e:
             self.report({'ERROR'}, str(e)); return {'CANCELLED'}
-        self.report({'INFO'}, f"OK | r={d['radius']:.4f} m | track={d['track']:.4f} m | maxRPM L/R {d['max_rpm_L']:.1f}/{d['max_rpm_R']:.1f}")
+        self.report({'INFO'}, f"OK | r={d['radius']:.4f} m | track={d['track']:.4f} m | maxRPM L/R {d['max_rpm_L']:.1f}/{d['max_rpm_R']:.1f}"
+                              f" | cache {d.nbytes / 1e6:.1f} MB")
+        if o is None:
+            self.report({'WARNING'}, "Odometry check skipped: needs wheels on both sides of the chassis.")
+        else:
+            worst = ", ".join(str(f) for f in o['worst_frames']) or "none"
+            self.report({'INFO'}, f"Odometry (measured r={o['radius']:.4f} m, track={o['track']:.4f} m) | drift max/rms {o['max_pos']:.4f}/{o['rms_pos']:.4f} m"
+                                  f", yaw {o['max_yaw']:.4f}/{o['rms_yaw']:.4f} rad | fastest growth at frames {worst}")
+        if context.scene.sg_props.cache_float32:
+            e = d['precision_error']
+            self.report({'INFO'}, f"float32 cache error ≤ {e['pos']:.2e} m, {e['angle']:.2e} rad"
+                                  f" | derived ≤ {e['rpm']:.2e} rpm, {e['speed']:.2e} m/s")
+        if d['scrub_intervals']:
+            iv = d['scrub_intervals']
+            head = ", ".join(f"{a}–{b}" for a, b in iv[:6]) + (" …" if len(iv)>6 else "")
+            self.report({'WARNING'}, f"Wheel scrub up to {d['max_scrub']:.3f} m/s exceeds sideways tolerance > {context.scene.sg_props.side_tol} (frames {head}).")
         return {'FINISHED'}
 
 
@@ -205,6 +254,8 @@ CLASSES = (
     SG_Props,
     SG_PT_Panel,
     SG_OT_ValidateMotion,
+    SG_OT_JumpViolation,
+    SG_OT_ClearViolationMarkers,
     SG_OT_AutocorrectBake,
     SG_OT_AutocorrectSEase,
     SG_OT_AutocorrectLinear,
@@ -0,0 +1,157 @@
+# core_cache.py
+# Wheel cache container: stored base channels, lazily derived channels, float32 packing.
+# No bpy; safe to unit test headless.
+import numpy as np
+from collections import OrderedDict
+from math import pi
+
+def _f64(v):
+    return np.asarray(v, dtype=np.float64)
+
+def _steps(c):
+    # forward / lateral travel and yaw change per step along the mid-step heading
+    x, y, yaw = _f64(c["x"]), _f64(c["y"]), _f64(c["yaw"])
+    dyaw = np.diff(yaw)
+    hm = yaw[:-1] + c["heading_offset"] + 0.5 * dyaw
+    dx, dy = np.diff(x), np.diff(y)
+    return dx * np.cos(hm) + dy * np.sin(hm), -dx * np.sin(hm) + dy * np.cos(hm), dyaw
+
+def _wheel_slip(c, side):
+    """
+    Skid-steer slip for one side, batched as wheels × samples (m/s). All wheels on a side
+    are driven together with the side θ, so longitudinal slip is each wheel's contact
+    speed minus r·ω of its side (nonzero whenever the wheel's lateral offset differs from
+    track_width/2 while turning); lateral slip is scrub across the wheel.
+    """
+    ds, dlat, dyaw = c["_steps"]
+    a, b = c["wheel_offset" + side].T
+    half = 0.5 * c["track"]
+    track_ds = ds - dyaw * half if side == 'L' else ds + dyaw * half   # r·ω·dt of the side
+    dfw = ds[None, :] - b[:, None] * dyaw[None, :]
+    dlw = dlat[None, :] + a[:, None] * dyaw[None, :]
+    lead = np.zeros((a.size, 1))
+    fps = c["fps"]
+    return np.hstack((lead, (dfw - track_ds[None, :]) * fps)), np.hstack((lead, dlw * fps))
+
+_RPM_PER_RAD_S = 60.0 / (2.0 * pi)
+
+def _max_rpm(theta, fps):
+    return float(np.abs(np.gradient(_f64(theta))).max()) * fps * _RPM_PER_RAD_S
+
+_DERIVED = {"_steps": _steps}
+for _s in ('L', 'R'):
+    _DERIVED.update({
+        "omega" + _s:           lambda c, s=_s: np.gradient(_f64(c["theta" + s])) * c["fps"],
+        "rpm" + _s:             lambda c, s=_s: c["omega" + s] * _RPM_PER_RAD_S,
+        "accel" + _s:           lambda c, s=_s: np.gradient(c["omega" + s]) * c["fps"],
+        "_wheel_slip" + _s:     lambda c, s=_s: _wheel_slip(c, s),
+    })
+# views into a cached entry; resolved on each access, never LRU entries themselves
+_VIEWS = {}
+for _s in ('L', 'R'):
+    _VIEWS["wheel_slip_long" + _s] = ("_wheel_slip" + _s, 0)
+    _VIEWS["wheel_slip_lat" + _s] = ("_wheel_slip" + _s, 1)
+_EAGER = [k for k in _DERIVED if not k.startswith("_")] + list(_VIEWS)
+
+# float32 mode keeps base channels as float32 per-step deltas plus a float64 anchor;
+# the full-length channel is rebuilt in float64 on access, so rates keep float32 relative
+# precision. Float64 prefix sums every _BLOCK samples serve single-sample reads (drivers).
+_PACKED = ("x", "y", "yaw", "thetaL", "thetaR")
+for _k in _PACKED:
+    _DERIVED[_k] = lambda c, k=_k: c["_a_" + k] + np.concatenate(([0.0], np.cumsum(c["_d_" + k], dtype=np.float64)))
+_BLOCK = 1024
+
+_LRU_BYTES = 64 * 2**20
+
+def _nbytes(v):
+    if isinstance(v, tuple):
+        return sum(_nbytes(e) for e in v)
+    return v.nbytes if isinstance(v, np.ndarray) else 0
+
+class RoboCache(dict):
+    """
+    Wheel cache. Base channels (pose, θ) are stored; derived channels (ω, RPM, accel,
+    per-wheel slip) resolve on first access and are kept in an LRU bounded by bytes
+    unless the cache was built eagerly. Indexing, get() and `in` all see derived channels;
+    value_at() reads a single sample cheaply, also from packed float32 channels.
+    """
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self._lru = OrderedDict()
+        self._lru_bytes = 0
+
+    def __missing__(self, key):
+        if key in _VIEWS:
+            src, i = _VIEWS[key]
+            return self[src][i]
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return self._lru[key]
+        fn = _DERIVED.get(key)
+        if fn is None:
+            raise KeyError(key)
+        v = self._lru[key] = fn(self)
+        self._lru_bytes += _nbytes(v)
+        # always keep the newest entry, even if it alone exceeds the budget
+        while self._lru_bytes > _LRU_BYTES and len(self._lru) > 1:
+            self._lru_bytes -= _nbytes(self._lru.popitem(last=False)[1])
+        return v
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in _DERIVED or key in _VIEWS
+
+    def value_at(self, key, i):
+        """
+        One sample of a channel without materialising it: packed base channels read the
+        nearest float64 block prefix sum plus at most _BLOCK float32 deltas.
+        """
+        if not dict.__contains__(self, key) and key in _PACKED and key not in self._lru:
+            k = i // _BLOCK
+            return float(self["_b_" + key][k] + self["_d_" + key][k * _BLOCK:i].sum(dtype=np.float64))
+        return float(self[key][i])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear_lru(self):
+        self._lru.clear()
+        self._lru_bytes = 0
+
+    def materialize(self):
+        for k in _EAGER:
+            self[k] = self[k]
+        self.clear_lru()
+
+    @property
+    def nbytes(self):
+        return sum(v.nbytes for v in self.values() if isinstance(v, np.ndarray))
+
+def _pack_float32(c):
+    """
+    Replace base channels with float32 deltas + float64 anchors. Returns the worst absolute
+    error of the rebuilt base channels and of the derived rates, measured against float64.
+    """
+    fps = c["fps"]
+    ref_rate = {s: np.gradient(_f64(c["theta" + s])) for s in ('L', 'R')}
+    ref_speed = np.hypot(*c["_steps"][:2]) * fps
+    ref = {k: c.pop(k) for k in _PACKED}
+    for k, v in ref.items():
+        c["_d_" + k] = np.diff(v).astype(np.float32)
+        c["_a_" + k] = float(v[0])
+    c.clear_lru()
+    for k in _PACKED:
+        c["_b_" + k] = c[k][::_BLOCK].copy()
+
+    err = {k: float(np.abs(c[k] - v).max()) for k, v in ref.items()}
+    rpm_err = max(float(np.abs(np.gradient(c["theta" + s]) - ref_rate[s]).max()) for s in ('L', 'R'))
+    speed_err = float(np.abs(np.hypot(*c["_steps"][:2]) * fps - ref_speed).max())
+    c.clear_lru()
+    return {
+        "pos": max(err["x"], err["y"]),
+        "angle": max(err["yaw"], err["thetaL"], err["thetaR"]),
+        "rpm": rpm_err * fps * _RPM_PER_RAD_S,
+        "speed": speed_err,
+    }
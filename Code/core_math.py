@@ -0,0 +1,76 @@
+# core_math.py
+# Pure math shared by the cache and its checks. No bpy; safe to unit test headless.
+import numpy as np
+
+# drift growth below this fraction of the travelled path length is float noise
+_DRIFT_REL_TOL = 1e-6
+
+def integrate_diff_drive(dL, dR, track, x0, y0, yaw0, heading_offset):
+    """
+    Integrate per-step left/right wheel arc lengths (m) into x, y, yaw arrays
+    (one sample longer than the steps), using the mid-step heading.
+    """
+    ds = 0.5 * (dR + dL)
+    dyaw = (dR - dL) / track
+    yaw = yaw0 + np.concatenate(([0.0], np.cumsum(dyaw)))
+    hm = yaw[:-1] + heading_offset + 0.5 * dyaw
+    x = x0 + np.concatenate(([0.0], np.cumsum(ds * np.cos(hm))))
+    y = y0 + np.concatenate(([0.0], np.cumsum(ds * np.sin(hm))))
+    return x, y, yaw
+
+def odometry_drift(dL, dR, track, x, y, yaw, heading_offset, f0=0, top_k=5):
+    """
+    Dead-reckon the wheel arcs and compare against the reference path x/y/yaw.
+    Returns dict: {'max_pos', 'rms_pos', 'max_yaw', 'rms_yaw', 'worst_frames'} (metres / radians).
+    worst_frames lists up to top_k frames where positional drift grows fastest.
+    """
+    x_i, y_i, yaw_i = integrate_diff_drive(dL, dR, track, x[0], y[0], yaw[0], heading_offset)
+    pos_err = np.hypot(x_i - x, y_i - y)
+    yaw_err = np.abs(yaw_i - yaw)
+
+    growth = np.diff(pos_err)
+    floor = _DRIFT_REL_TOL * max(float(np.hypot(np.diff(x), np.diff(y)).sum()), track)
+    k = min(int(top_k), growth.size)
+    worst = []
+    if k > 0:
+        idx = np.argpartition(growth, -k)[-k:]
+        idx = idx[np.argsort(growth[idx])[::-1]]
+        worst = [int(f0 + 1 + i) for i in idx if growth[i] > floor]
+
+    return {
+        "max_pos": float(pos_err.max()),
+        "rms_pos": float(np.sqrt(np.mean(pos_err * pos_err))),
+        "max_yaw": float(yaw_err.max()),
+        "rms_yaw": float(np.sqrt(np.mean(yaw_err * yaw_err))),
+        "worst_frames": worst,
+    }
+
+def measured_odometry(wheels, x, y, yaw, heading_offset, f0=0, top_k=5, eps=1e-6):
+    """
+    Odometry drift from per-wheel measured geometry. wheels yields
+    (theta, lateral_offset_m, roll_sign, radius_m, side_label) per wheel, where theta is the
+    angle series the wheel is driven with and roll_sign is +1 when positive rotation rolls
+    it forward. Wheels go to the physical side given by their offset (+ = left); wheels
+    within eps of the centre line use their side label and are left out of the track width.
+    Returns odometry_drift's dict plus measured 'track' and 'radius', or None unless both
+    sides have a wheel off the centre line.
+    """
+    arc = {True: 0.0, False: 0.0}
+    count = {True: 0, False: 0}
+    offs = {True: [], False: []}
+    radii = []
+    for theta, b, roll, r, side in wheels:
+        left = b > 0.0 if abs(b) >= eps else side == 'L'
+        arc[left] = arc[left] + np.diff(np.asarray(theta, dtype=np.float64)) * (roll * r)
+        count[left] += 1
+        if abs(b) >= eps:
+            offs[left].append(b)
+        radii.append(r)
+    if not offs[True] or not offs[False]:
+        return None
+
+    track = float(np.mean(offs[True]) - np.mean(offs[False]))
+    d = odometry_drift(arc[True] / count[True], arc[False] / count[False], track,
+                       x, y, yaw, heading_offset, f0, top_k)
+    d.update(track=track, radius=float(np.mean(radii)))
+    return d
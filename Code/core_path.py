@@ -1,9 +1,13 @@
 # core_path.py
 # Path feasibility, autocorrect scaffolds, and keyframe backup/restore.
 import bpy
+import numpy as np
+from bisect import bisect_left, bisect_right
 from math import sin, cos, pi
 
 _BACKUP_KEY = "SG_BACKUP"
+_MARKER_PREFIX = "SG_SLIP "
+_SLIP_KEY = "sg_slip_intervals"
 
 # ---------------------- small helpers ----------------------
 def _axis_unit(axis_char: str):
@@ -33,67 +37,141 @@ def _body_basis_from_yaw(theta, forward_axis):
     lat = (-fwd[1], fwd[0])
     return fwd, lat
 
-# ---------------------- feasibility (no sideways slip per frame) ----------------------
-def analyze_motion(context):
+def _heading_offset(forward_axis):
+    # Angle from world yaw to the body-forward direction; same mapping as _body_basis_from_yaw.
+    if   forward_axis == '+Y': return 0.5 * pi
+    elif forward_axis == '-Y': return -0.5 * pi
+    elif forward_axis == '-X': return pi
+    return 0.0  # +X
+
+# ---------------------- chassis sampling ----------------------
+def sample_chassis(context):
     """
-    Check per-frame lateral slip of chassis vs tolerance.
-    Returns dict: {'violations': int, 'violation_frames': [..], 'side_tol': float, 'fps': float}
+    Sample chassis world pose once per frame over the scene range.
+    Returns dict: {'f0': int, 'fps': float, 'x': ndarray, 'y': ndarray, 'yaw': ndarray (unwrapped)}
     """
     scn = context.scene
-    P = scn.sg_props
-    ch = P.chassis
+    ch = scn.sg_props.chassis
     if not ch:
         raise RuntimeError("Assign the Chassis.")
-    if P.track_width <= 0:
-        raise RuntimeError("Track width must be > 0.")
     if scn.frame_end <= scn.frame_start:
         raise RuntimeError("Scene frame range invalid.")
 
-    fps = scn.render.fps / scn.render.fps_base
-    dt = 1.0 / float(fps)
     f0, f1 = scn.frame_start, scn.frame_end
+    n = f1 - f0 + 1
+    x = np.empty(n); y = np.empty(n); yaw = np.empty(n)
     deps = context.evaluated_depsgraph_get()
+    f_keep = scn.frame_current
+    for i, f in enumerate(range(f0, f1 + 1)):
+        scn.frame_set(f); deps.update()
+        mw = ch.matrix_world
+        x[i] = mw.translation.x
+        y[i] = mw.translation.y
+        yaw[i] = mw.to_euler('XYZ').z
+    scn.frame_set(f_keep)
 
-    # sample first frame
-    scn.frame_set(f0); deps.update()
-    mw = ch.matrix_world
-    prev_loc = mw.translation.copy()
-    prev_yaw = mw.to_euler('XYZ').z
+    return {
+        "f0": int(f0),
+        "fps": float(scn.render.fps / scn.render.fps_base),
+        "x": x,
+        "y": y,
+        "yaw": np.unwrap(yaw),
+    }
 
-    side_tol = float(P.side_tol)
-    v_frames = []
-    violations = 0
+# ---------------------- feasibility (no sideways slip per frame) ----------------------
+def _runs(mask):
+    """Run-length encode a boolean array -> (starts, ends) index arrays, ends exclusive."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
 
-    for f in range(f0 + 1, f1 + 1):
-        scn.frame_set(f); deps.update()
-        mw = ch.matrix_world
-        loc = mw.translation
-        yaw = mw.to_euler('XYZ').z
+def analyze_motion(context):
+    """
+    Check per-frame lateral slip of chassis vs tolerance.
+    Returns dict: {'violations': int, 'intervals': [(f_start, f_end, peak_lat_v), ..],
+                   'side_tol': float, 'fps': float, 'f0': int, 'f1': int}
+    Intervals are inclusive frame ranges of contiguous violating steps.
+    """
+    scn = context.scene
+    P = scn.sg_props
+    if P.track_width <= 0:
+        raise RuntimeError("Track width must be > 0.")
 
-        # body basis at previous frame
-        _, lat = _body_basis_from_yaw(prev_yaw, P.body_forward_axis)
+    s = sample_chassis(context)
+    x, y, yaw, fps, f0 = s["x"], s["y"], s["yaw"], s["fps"], s["f0"]
 
-        # lateral displacement per second
-        dx = float(loc.x - prev_loc.x)
-        dy = float(loc.y - prev_loc.y)
-        lat_v = (dx * lat[0] + dy * lat[1]) / dt
+    # lateral velocity per step, body basis at previous frame
+    h = yaw[:-1] + _heading_offset(P.body_forward_axis)
+    lat_v = (np.diff(x) * -np.sin(h) + np.diff(y) * np.cos(h)) * fps
+    abs_v = np.abs(lat_v)
 
-        if abs(lat_v) > side_tol:
-            violations += 1
-            v_frames.append(f)
+    side_tol = float(P.side_tol)
+    bad = abs_v > side_tol
+    i0, i1 = _runs(bad)
+    # gaps are zeroed so each reduceat segment [start_k, start_k+1) peaks inside its own run
+    peaks = np.maximum.reduceat(np.where(bad, abs_v, 0.0), i0) if i0.size else np.empty(0)
 
-        prev_loc = loc.copy()
-        prev_yaw = yaw
+    # step i ends at frame f0 + 1 + i
+    starts = f0 + 1 + i0
+    ends = f0 + i1
 
     return {
-        "violations": violations,
-        "violation_frames": v_frames,
+        "violations": int(bad.sum()),
+        "intervals": [(int(a), int(b), float(p)) for a, b, p in zip(starts, ends, peaks)],
         "side_tol": side_tol,
         "fps": float(fps),
         "f0": int(f0),
-        "f1": int(f1),
+        "f1": int(f0 + x.size - 1),
     }
 
+# ---------------------- violation index / timeline markers ----------------------
+# Intervals from the last Validate Motion are stored on the scene (saved with the file)
+# as sorted parallel arrays; markers are only their timeline view.
+def violation_intervals(context):
+    """Stored (f_start, f_end, peak_lat_v) intervals of the scene, sorted by start."""
+    iv = context.scene.get(_SLIP_KEY)
+    if not iv:
+        return []
+    return list(zip(iv["starts"], iv["ends"], iv["peaks"]))
+
+def violation_jump(context, direction):
+    """
+    Frame of the next (direction > 0) or previous violation interval start relative to
+    the current frame, via binary search on the scene's stored starts. None if there is none.
+    """
+    iv = context.scene.get(_SLIP_KEY)
+    if not iv:
+        return None
+    starts = iv["starts"]
+    f = context.scene.frame_current
+    if direction > 0:
+        i = bisect_right(starts, f)
+        return int(starts[i]) if i < len(starts) else None
+    i = bisect_left(starts, f) - 1
+    return int(starts[i]) if i >= 0 else None
+
+def clear_violation_markers(context):
+    """Remove the stored intervals and their markers. Returns markers removed."""
+    scn = context.scene
+    if _SLIP_KEY in scn:
+        del scn[_SLIP_KEY]
+    markers = scn.timeline_markers
+    ours = [m for m in markers if m.name.startswith(_MARKER_PREFIX)]
+    for m in ours:
+        markers.remove(m)
+    return len(ours)
+
+def set_violation_markers(context, intervals):
+    """Store intervals on the scene and add one marker per interval start. Returns markers created."""
+    clear_violation_markers(context)
+    if not intervals:
+        return 0
+    starts, ends, peaks = zip(*intervals)
+    context.scene[_SLIP_KEY] = {"starts": list(starts), "ends": list(ends), "peaks": list(peaks)}
+    markers = context.scene.timeline_markers
+    for f_start, f_end, peak in intervals:
+        markers.new(f"{_MARKER_PREFIX}{f_start}-{f_end} {peak:.3f}m/s", frame=f_start)
+    return len(intervals)
+
 # ---------------------- keyframe backup / restore ----------------------
 def _ensure_xyz_euler(obj):
     try:
@@ -176,7 +254,7 @@ def build_s_ease_curve_and_bake(context):
     # placeholder: just validate and report zero frames if violations exist
     a = analyze_motion(context)
     if a["violations"] > 0:
-        raise RuntimeError(f"Violations present: {a['violations']} (first at frame {a['violation_frames'][0]})")
+        raise RuntimeError(f"Violations present: {a['violations']} (first at frame {a['intervals'][0][0]})")
     # If no violations, nothing to fix. Return current frame span.
     return (a["f1"] - a["f0"] + 1)
 
@@ -1,38 +1,303 @@
 # core_rpm.py
 import bpy
+import numpy as np
+
+from .core_cache import RoboCache, _f64, _max_rpm, _pack_float32
+from .core_math import measured_odometry
+from .core_path import sample_chassis, _heading_offset, _iter_side, _axis_unit, _body_basis_from_yaw, _runs
 
 _DRIVER_KEY = "roboanim_cache"
+_REST_EULER = "sg_rest_euler"
+_REST_QUAT = "sg_rest_quat"
+_IPO_LINEAR = 1   # keyframe interpolation enum value (CONSTANT=0, LINEAR=1, BEZIER=2)
+
+# ---------------------- driver namespace lookups ----------------------
+def _frame_index(c, frame):
+    return min(max(int(round(frame - c["f0"])), 0), c["n"] - 1)
+
+def _quat_mul(a, b):
+    # Hamilton product on (w, x, y, z); works elementwise on numpy arrays too.
+    aw, ax, ay, az = a; bw, bx, by, bz = b
+    return (aw*bw - ax*bx - ay*by - az*bz,
+            aw*bx + ax*bw + ay*bz - az*by,
+            aw*by - ax*bz + ay*bw + az*bx,
+            aw*bz + ax*by - ay*bx + az*bw)
+
+def _axis_quat(theta, axis):
+    u = _axis_unit(axis); s = np.sin(0.5 * theta)
+    return (np.cos(0.5 * theta), s * u[0], s * u[1], s * u[2])
+
+def sg_theta(side, frame):
+    c = get_cache()
+    if not c:
+        return 0.0
+    return c.value_at("thetaL" if side == 'L' else "thetaR", _frame_index(c, frame))
+
+def _wheel_theta_row(c, name):
+    # θ series a wheel object is driven/baked with: its side's θ
+    side, _ = c["wheel_index"][name]
+    return c["theta" + side]
+
+def sg_wheel_theta(name, frame):
+    c = get_cache()
+    if not c or name not in c["wheel_index"]:
+        return 0.0
+    return c.value_at("theta" + c["wheel_index"][name][0], _frame_index(c, frame))
+
+def sg_quat_comp_obj(side, frame, comp, axis, rw, rx, ry, rz):
+    return float(_quat_mul((rw, rx, ry, rz), _axis_quat(sg_theta(side, frame), axis))[comp])
+
+def sg_wheel_quat(name, frame, comp, axis, rw, rx, ry, rz):
+    return float(_quat_mul((rw, rx, ry, rz), _axis_quat(sg_wheel_theta(name, frame), axis))[comp])
 
 def register_driver_functions():
-    # install placeholders into driver namespace if you use scripted expressions later
+    # install lookups into driver namespace for scripted expressions
     ns = bpy.app.driver_namespace
-    ns.setdefault("sg_theta", lambda side, frame: 0.0)
-    ns.setdefault("sg_quat_comp_obj", lambda side, frame, comp, axis, rw, rx, ry, rz: (1.0,0.0,0.0,0.0)[comp])
+    ns["sg_theta"] = sg_theta
+    ns["sg_quat_comp_obj"] = sg_quat_comp_obj
+    ns["sg_wheel_theta"] = sg_wheel_theta
+    ns["sg_wheel_quat"] = sg_wheel_quat
+
+def get_cache():
+    """The current cache, or None before Build Cache."""
+    return bpy.app.driver_namespace.get(_DRIVER_KEY)
 
 def driver_key_available():
     return _DRIVER_KEY in bpy.app.driver_namespace
 
+def _side_sign(P, side):
+    s = -1.0 if (P.sign_l if side == 'L' else P.sign_r) == 'MINUS' else 1.0
+    return -s if P.wheel_forward_invert else s
+
+def _wheel_radius(P):
+    if P.auto_radius:
+        dims = [max(o.dimensions) for side in ('L', 'R') for o in _iter_side(P, side) if o.type == 'MESH']
+        if dims:
+            return 0.5 * float(np.median(dims))
+    return float(P.wheel_radius)
+
+def _wheel_offsets(P, side):
+    """
+    Body-frame (forward, lateral) offset in metres of each wheel on a side, read once from
+    the world-space offset to the chassis rotated by chassis yaw only (chassis scale ignored).
+    Wheels are ordered by name. Wheels stacked at one axle position fall back to
+    tire_spacing between axles in that order; wheels on the centre line fall back to
+    track_width/2 laterally.
+    """
+    objs = sorted(_iter_side(P, side), key=lambda o: o.name)
+    n = len(objs)
+    mw = P.chassis.matrix_world
+    fwd, lat = _body_basis_from_yaw(mw.to_euler('XYZ').z, P.body_forward_axis)
+    pts = np.array([(o.matrix_world.translation - mw.translation).xy[:] for o in objs]).reshape(n, 2)
+    a = pts @ np.array(fwd)
+    b = pts @ np.array(lat)
+    if n > 1 and np.ptp(a) < 1e-6:
+        a = (np.arange(n) - 0.5 * (n - 1)) * float(P.tire_spacing)
+    half = 0.5 * float(P.track_width)
+    b = np.where(np.abs(b) < 1e-6, half if side == 'L' else -half, b)
+    return [o.name for o in objs], a, b
+
 def build_cache(context):
-    # TODO: compute and stash arrays (thetaL, thetaR, etc.)
-    bpy.app.driver_namespace[_DRIVER_KEY] = {
-        "f0": context.scene.frame_start,
-        "fps": context.scene.render.fps / context.scene.render.fps_base,
-        "thetaL": [0.0]*(context.scene.frame_end-context.scene.frame_start+1),
-        "thetaR": [0.0]*(context.scene.frame_end-context.scene.frame_start+1),
-        "max_rpm_L": 0.0, "max_rpm_R": 0.0,
-        "radius": getattr(context.scene.sg_props, "wheel_radius", 0.0),
-        "track":  getattr(context.scene.sg_props, "track_width", 0.0),
-    }
-    return bpy.app.driver_namespace[_DRIVER_KEY]
+    """
+    Convert sampled chassis motion to per-side wheel θ (differential drive, midpoint heading)
+    plus per-wheel skid-steer slip, and stash them in the driver namespace. Every wheel on a
+    side is driven with that side's θ. Derived channels are materialised up front in FULL
+    mode, on demand in LEAN mode; summary stats are computed one channel / wheel at a time.
+    Returns the cache.
+    """
+    P = context.scene.sg_props
+    if P.track_width <= 0:
+        raise RuntimeError("Track width must be > 0.")
+    s = sample_chassis(context)
+    r = _wheel_radius(P)
+    half = 0.5 * float(P.track_width)
+    sgnL, sgnR = _side_sign(P, 'L'), _side_sign(P, 'R')
+
+    c = RoboCache({
+        "f0": s["f0"],
+        "fps": s["fps"],
+        "n": int(s["x"].size),
+        "x": s["x"], "y": s["y"], "yaw": s["yaw"],
+        "radius": r,
+        "track":  float(P.track_width),
+        "signL": sgnL, "signR": sgnR,
+        "heading_offset": _heading_offset(P.body_forward_axis),
+    })
+    ds, _, dyaw = c["_steps"]
+    c["thetaL"] = sgnL * np.concatenate(([0.0], np.cumsum((ds - dyaw * half) / r)))
+    c["thetaR"] = sgnR * np.concatenate(([0.0], np.cumsum((ds + dyaw * half) / r)))
+    del ds, dyaw
+
+    wheel_index = {}
+    for side in ('L', 'R'):
+        names, a, b = _wheel_offsets(P, side)
+        c["wheel_names" + side] = names
+        c["wheel_offset" + side] = np.column_stack((a, b))
+        wheel_index.update((n, (side, i)) for i, n in enumerate(names))
+    c["wheel_index"] = wheel_index
+
+    c["precision_error"] = {"pos": 0.0, "angle": 0.0, "rpm": 0.0, "speed": 0.0}
+    if P.cache_float32:
+        c["precision_error"] = _pack_float32(c)
+    c.clear_lru()
+    if P.cache_mode == 'FULL':
+        c.materialize()
+
+    c["max_rpm_L"] = _max_rpm(c["thetaL"], c["fps"])
+    c["max_rpm_R"] = _max_rpm(c["thetaR"], c["fps"])
+    # scrub: worst lateral wheel slip per sample, one wheel at a time; flag stretches above side_tol
+    _, dlat, dyaw = c["_steps"]
+    scrub = np.zeros(c["n"])
+    for side in ('L', 'R'):
+        for a in c["wheel_offset" + side][:, 0]:
+            np.maximum(scrub[1:], np.abs(dlat + a * dyaw) * c["fps"], out=scrub[1:])
+    i0, i1 = _runs(scrub > float(P.side_tol))
+    c["max_scrub"] = float(scrub.max())
+    c["scrub_intervals"] = [(int(s["f0"] + a), int(s["f0"] + b - 1)) for a, b in zip(i0, i1)]
+
+    bpy.app.driver_namespace[_DRIVER_KEY] = c
+    return c
+
+def _mesh_radius(o):
+    # half the largest world-space extent of the mesh bounds
+    bb = np.array([tuple(v) for v in o.bound_box])
+    ext = bb.max(axis=0) - bb.min(axis=0)
+    scale = np.array([o.matrix_world.col[k].xyz.length for k in range(3)])
+    return 0.5 * float((ext * scale).max())
+
+def _measured_wheels(P, c):
+    """
+    Per-wheel geometry measured from the objects rather than the settings, as
+    (θ driven, lateral offset m (+left of body forward), rolling sign, radius, side label)
+    for core_math.measured_odometry. The rolling sign is +1 when positive rotation about
+    the wheel axis rolls the wheel forward; the axis is the object's local axis column,
+    exact for the innermost Euler channel. Radius comes from the wheel mesh.
+    """
+    mw = P.chassis.matrix_world
+    _, lat = _body_basis_from_yaw(mw.to_euler('XYZ').z, P.body_forward_axis)
+    ax = 'XYZ'.index(P.wheel_axis)
+    for name, o in _cache_wheels(P, c):
+        d = o.matrix_world.translation - mw.translation
+        axis = o.matrix_world.to_3x3().col[ax].normalized()
+        roll = np.sign(axis.x * lat[0] + axis.y * lat[1])
+        if roll == 0.0:
+            continue
+        r = _mesh_radius(o) if o.type == 'MESH' else float(c["radius"])
+        yield _wheel_theta_row(c, name), d.x * lat[0] + d.y * lat[1], float(roll), r, c["wheel_index"][name][0]
+
+def verify_odometry(context, cache, top_k=5):
+    """
+    Dead-reckon the θ each wheel object is driven with, using track width, radius and
+    rolling direction measured from the wheel objects themselves, and measure drift
+    against the cached chassis path. Wrong track_width, radius, sign or swap_lr settings
+    show up as drift. Returns core_math.measured_odometry's dict, or None if there are
+    no wheels on both physical sides.
+    """
+    P = context.scene.sg_props
+    return measured_odometry(_measured_wheels(P, cache),
+                             _f64(cache["x"]), _f64(cache["y"]), _f64(cache["yaw"]),
+                             cache["heading_offset"], cache["f0"], top_k)
+
+# ---------------------- drivers / bake / clear ----------------------
+def _cache_wheels(P, c):
+    for name in c["wheel_index"]:
+        o = bpy.data.objects.get(name)
+        if o:
+            yield name, o
+
+def _rest_euler(o, ax):
+    if _REST_EULER not in o:
+        o[_REST_EULER] = float(o.rotation_euler[ax])
+    return float(o[_REST_EULER])
+
+def _rest_quat(o):
+    if _REST_QUAT not in o:
+        o[_REST_QUAT] = list(o.rotation_quaternion)
+    return tuple(float(v) for v in o[_REST_QUAT])
+
+def _new_fcurve(o, path, idx):
+    if not o.animation_data:
+        o.animation_data_create()
+    if not o.animation_data.action:
+        o.animation_data.action = bpy.data.actions.new(name=f"{o.name}Action")
+    fcs = o.animation_data.action.fcurves
+    old = fcs.find(path, index=idx)
+    if old:
+        fcs.remove(old)
+    return fcs.new(data_path=path, index=idx)
+
+def _write_keys(fc, frames, values):
+    kp = fc.keyframe_points
+    kp.add(len(frames))
+    kp.foreach_set("co", np.column_stack((frames, values)).astype(np.float32).ravel())
+    kp.foreach_set("interpolation", np.full(len(frames), _IPO_LINEAR, dtype=np.int32))
+    fc.update()
 
 def attach_drivers(context):
-    # TODO: wire real scripted drivers
+    """Attach one scripted driver per wheel reading its own θ from the cache."""
+    P = context.scene.sg_props
+    c = get_cache()
+    register_driver_functions()
+    ax = 'XYZ'.index(P.wheel_axis)
+    for name, o in _cache_wheels(P, c):
+        if P.rotation_mode == 'EULER':
+            if o.rotation_mode in {'QUATERNION', 'AXIS_ANGLE'}:
+                o.rotation_mode = 'XYZ'
+            rest = _rest_euler(o, ax)
+            o.driver_remove("rotation_euler", ax)
+            d = o.driver_add("rotation_euler", ax).driver
+            d.type = 'SCRIPTED'
+            d.expression = f"sg_wheel_theta({name!r}, frame) + {rest!r}"
+        else:
+            o.rotation_mode = 'QUATERNION'
+            rw, rx, ry, rz = _rest_quat(o)
+            o.driver_remove("rotation_quaternion")
+            for k in range(4):
+                d = o.driver_add("rotation_quaternion", k).driver
+                d.type = 'SCRIPTED'
+                d.expression = f"sg_wheel_quat({name!r}, frame, {k}, {P.wheel_axis!r}, {rw!r}, {rx!r}, {ry!r}, {rz!r})"
     return True
 
 def bake_wheels(context):
-    # TODO: write rotations as keyframes
-    return True
+    """Replace wheel drivers with per-frame rotation keyframes from the cache. Returns frames baked."""
+    P = context.scene.sg_props
+    c = get_cache()
+    ax = 'XYZ'.index(P.wheel_axis)
+    n = c["n"]
+    frames = c["f0"] + np.arange(n, dtype=np.float64)
+    for name, o in _cache_wheels(P, c):
+        theta = _f64(_wheel_theta_row(c, name))
+        if P.rotation_mode == 'EULER':
+            if o.rotation_mode in {'QUATERNION', 'AXIS_ANGLE'}:
+                o.rotation_mode = 'XYZ'
+            rest = _rest_euler(o, ax)
+            o.driver_remove("rotation_euler", ax)
+            _write_keys(_new_fcurve(o, "rotation_euler", ax), frames, theta + rest)
+        else:
+            o.rotation_mode = 'QUATERNION'
+            q = _quat_mul(_rest_quat(o), _axis_quat(theta, P.wheel_axis))
+            o.driver_remove("rotation_quaternion")
+            for k in range(4):
+                _write_keys(_new_fcurve(o, "rotation_quaternion", k), frames, q[k])
+    return n
 
 def clear_wheels(context):
-    # TODO: remove drivers + rotation keyframes; return bool if anything removed
-    return False
+    """Remove wheel rotation drivers and keyframes, restoring rest rotation. True if anything was removed."""
+    P = context.scene.sg_props
+    removed = False
+    for o in _iter_side(P, 'L') + _iter_side(P, 'R'):
+        for path in ("rotation_euler", "rotation_quaternion"):
+            removed |= bool(o.driver_remove(path))
+        ad = o.animation_data
+        if ad and ad.action:
+            for fc in list(ad.action.fcurves):
+                if fc.data_path in ("rotation_euler", "rotation_quaternion"):
+                    ad.action.fcurves.remove(fc)
+                    removed = True
+        if _REST_EULER in o:
+            o.rotation_euler['XYZ'.index(P.wheel_axis)] = o[_REST_EULER]
+            del o[_REST_EULER]
+        if _REST_QUAT in o:
+            o.rotation_quaternion = o[_REST_QUAT]
+            del o[_REST_QUAT]
+    return removed
@@ -1,8 +1,54 @@
 # export.py
+import csv
+import bpy
+import numpy as np
+from math import pi
+
+from .core_rpm import get_cache
+
+_LENGTH = {'M': 1.0, 'CM': 100.0}
+_ANGLE = {'RAD': 1.0, 'DEG': 180.0 / pi}
+_ANGRATE = {'RPM': 1.0, 'RPS': 1.0 / 60.0, 'DEGS': 6.0}   # from rpm
+_CHUNK_ROWS = 65536
+
 def write_animation_csv(context):
-    # TODO: sample chassis + wheels and write CSV
-    path = context.scene.sg_props.csv_path
-    return 0, path
+    """
+    Write t, x, y, yaw, thetaR/L, rateR/L plus per-wheel slip from the cache,
+    resampled to scene FPS or a fixed rate. Returns (rows_written, path).
+    """
+    P = context.scene.sg_props
+    c = get_cache()
+    if not c:
+        raise RuntimeError("Build Cache first.")
+    path = bpy.path.abspath(P.csv_path)
+
+    n = c["n"]
+    t_src = np.arange(n) / c["fps"]
+    t = np.arange(0.0, t_src[-1] + 1e-9, 1.0 / P.fixed_rate) if P.sample_mode == 'FIXED' else t_src
+    L, A, W = _LENGTH[P.length_unit], _ANGLE[P.angle_unit], _ANGRATE[P.angrate_unit]
+
+    def col(v, k=1.0):
+        return np.interp(t, t_src, v) * k
+
+    header = ["t", "x", "y", "yaw", "thetaR", "thetaL", "rateR", "rateL"]
+    cols = [t, col(c["x"], L), col(c["y"], L), col(c["yaw"], A),
+            col(c["thetaR"], A), col(c["thetaL"], A), col(c["rpmR"], W), col(c["rpmL"], W)]
+    for side in ('R', 'L'):
+        names = c["wheel_names" + side]
+        if not names:
+            continue
+        slip_long, slip_lat = c["wheel_slip_long" + side], c["wheel_slip_lat" + side]
+        for i, name in enumerate(names):
+            header += [f"slipLong_{name}", f"slipLat_{name}"]
+            cols += [col(slip_long[i], L), col(slip_lat[i], L)]
+
+    with open(path, "w", newline="") as fh:
+        wr = csv.writer(fh)
+        wr.writerow(header)
+        # only one chunk of rows is ever turned into Python floats
+        for i in range(0, len(t), _CHUNK_ROWS):
+            wr.writerows(np.column_stack([v[i:i + _CHUNK_ROWS] for v in cols]).tolist())
+    return len(t), path
 
 def write_keyframe_csv(context):
     # TODO: collect keyed transforms and write CSV
@@ -107,6 +107,21 @@ class SG_Props(bpy.types.PropertyGroup):
         min=0.0, soft_max=1_000_000.0, default=0.0,
     )
 
+    # --- Cache ---
+    cache_mode: bpy.props.EnumProperty(
+        name="Cache Mode",
+        items=[
+            ('FULL', "Full",  "Compute and store every channel (ω, RPM, accel, slip) at Build Cache"),
+            ('LEAN', "Lean",  "Store pose and θ only; derived channels are computed on first use"),
+        ],
+        default='FULL',
+    )
+    cache_float32: bpy.props.BoolProperty(
+        name="Store as float32",
+        description="Halve cache memory; Build Cache reports the worst rounding error",
+        default=False,
+    )
+
     # --- UI foldouts ---
     show_instructions: bpy.props.BoolProperty(name="Show Instructions", default=False)
     show_selection:   bpy.props.BoolProperty(name="Show Object Selection", default=True)
@@ -84,6 +84,10 @@ class SG_PT_Panel(bpy.types.Panel):
                 r.operator("segway.autocorrect_linear", text="Autocorrect", icon='MOD_SIMPLEDEFORM')
             else:
                 r.operator("segway.autocorrect_bake", text="Autocorrect", icon='MODIFIER')
+            r = c.row(align=True)
+            r.operator("segway.jump_violation", text="Prev Slip", icon='TRIA_LEFT').forward = False
+            r.operator("segway.jump_violation", text="Next Slip", icon='TRIA_RIGHT').forward = True
+            r.operator("segway.clear_violation_markers", text="", icon='MARKER_HLT')
             c.operator("segway.revert_autocorrect", icon='BACK')
 
         # --- RPM / Drivers / Bake ---
@@ -95,6 +99,10 @@ class SG_PT_Panel(bpy.types.Panel):
             c.prop(P, "max_ang_accel_rpm_s")
             c.separator()
             r = c.row(align=True)
+            r.prop(P, "cache_mode", expand=True)
+            r.prop(P, "cache_float32", text="float32")
+            c.separator()
+            r = c.row(align=True)
             r.operator("segway.build_cache", icon='FILE_CACHE')
             r.operator("segway.attach_drivers", icon='DRIVER')
             r.operator("segway.bake_wheels", icon='REC')
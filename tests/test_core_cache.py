@@ -0,0 +1,87 @@
+# Headless tests for Code/core_cache.py (no bpy needed).
+import importlib.util
+import pathlib
+
+import numpy as np
+
+_spec = importlib.util.spec_from_file_location(
+    "core_cache", pathlib.Path(__file__).resolve().parents[1] / "Code" / "core_cache.py")
+core_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(core_cache)
+
+FPS, HALF, R = 1000.0, 0.125, 0.06
+
+def _cache(n=200_000, x0=500.0):
+    # slow arc far from the origin, two wheels per side
+    t = np.arange(n) / FPS
+    yaw = 0.02 * t
+    x = x0 + np.cumsum(np.cos(yaw)) / FPS
+    y = np.cumsum(np.sin(yaw)) / FPS
+    c = core_cache.RoboCache({
+        "f0": 1, "fps": FPS, "n": n, "x": x, "y": y, "yaw": yaw,
+        "radius": R, "track": 2 * HALF, "heading_offset": 0.0,
+        "wheel_offsetL": np.array([[0.2, HALF], [-0.2, HALF]]),
+        "wheel_offsetR": np.array([[0.2, -HALF], [-0.2, -HALF]]),
+    })
+    ds, _, dyaw = c["_steps"]
+    c["thetaL"] = np.concatenate(([0.0], np.cumsum((ds - dyaw * HALF) / R)))
+    c["thetaR"] = np.concatenate(([0.0], np.cumsum((ds + dyaw * HALF) / R)))
+    c.clear_lru()
+    return c
+
+def test_float32_pack_keeps_rates_accurate():
+    ref = _cache()
+    rpm64 = ref["rpmL"].copy()
+    slip64 = ref["wheel_slip_latR"].copy()
+    c = _cache()
+    err = core_cache._pack_float32(c)
+    assert "thetaL" not in dict.keys(c) and c["_d_thetaL"].dtype == np.float32
+    assert np.abs(c["rpmL"] - rpm64).max() < 1e-3 * np.abs(rpm64).max()
+    assert np.abs(c["wheel_slip_latR"] - slip64).max() < 1e-4
+    assert err["rpm"] < 1e-3 * np.abs(rpm64).max()
+    assert err["speed"] < 1e-4
+    assert err["pos"] < 1e-3 and err["angle"] < 1e-2
+
+def test_value_at_matches_rebuilt_channel():
+    c = _cache()
+    core_cache._pack_float32(c)
+    n = c["n"]
+    idx = [0, 1, core_cache._BLOCK - 1, core_cache._BLOCK, 3 * core_cache._BLOCK + 7, n - 1]
+    full = c["thetaR"].copy()
+    c.clear_lru()
+    for i in idx:
+        assert abs(c.value_at("thetaR", i) - full[i]) < 1e-9
+    # single-sample reads must not rebuild the channel
+    assert "thetaR" not in c._lru
+
+def test_lru_is_bounded_by_bytes(monkeypatch):
+    c = _cache()
+    monkeypatch.setattr(core_cache, "_LRU_BYTES", 3 * c["x"].nbytes)
+    for k in ("omegaL", "rpmL", "accelL", "omegaR", "rpmR", "accelR"):
+        c[k]
+    assert c._lru_bytes <= 3 * c["x"].nbytes
+    assert c._lru_bytes == sum(core_cache._nbytes(v) for v in c._lru.values())
+
+def test_slip_views_do_not_evict_their_source(monkeypatch):
+    c = _cache()
+    monkeypatch.setattr(core_cache, "_LRU_BYTES", 1)
+    calls = []
+    real = core_cache._wheel_slip
+    monkeypatch.setattr(core_cache, "_wheel_slip", lambda cc, s: calls.append(s) or real(cc, s))
+    for _ in range(3):
+        c["wheel_slip_longL"], c["wheel_slip_latL"]
+    assert calls == ['L']
+    assert "wheel_slip_longL" not in c._lru and "wheel_slip_latL" not in c._lru
+
+def test_dict_idioms_see_virtual_channels():
+    c = _cache()
+    assert "omegaL" in c and "wheel_slip_latR" in c
+    assert c.get("omegaL") is not None
+    assert c.get("nope") is None and "nope" not in c
+
+def test_materialize_stores_derived_channels():
+    c = _cache()
+    c.materialize()
+    assert not c._lru
+    for k in ("omegaL", "rpmR", "accelL", "wheel_slip_longR", "wheel_slip_latL"):
+        assert k in dict.keys(c)
@@ -0,0 +1,105 @@
+# Headless tests for Code/core_math.py (no bpy needed).
+import importlib.util
+import pathlib
+
+import numpy as np
+
+_spec = importlib.util.spec_from_file_location(
+    "core_math", pathlib.Path(__file__).resolve().parents[1] / "Code" / "core_math.py")
+core_math = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(core_math)
+
+TRACK = 0.25
+
+def _arc(n=2000, fps=50.0, v=0.5, w=0.4):
+    # constant-speed arc, body forward = +X
+    t = np.arange(n) / fps
+    yaw = w * t
+    R = v / w
+    return R * np.sin(yaw), R * (1.0 - np.cos(yaw)), yaw
+
+def _wheel_arcs(x, y, yaw, track):
+    # same midpoint construction build_cache uses
+    dyaw = np.diff(yaw)
+    hm = yaw[:-1] + 0.5 * dyaw
+    ds = np.diff(x) * np.cos(hm) + np.diff(y) * np.sin(hm)
+    return ds - 0.5 * track * dyaw, ds + 0.5 * track * dyaw
+
+def test_matching_geometry_has_no_drift():
+    x, y, yaw = _arc()
+    dL, dR = _wheel_arcs(x, y, yaw, TRACK)
+    d = core_math.odometry_drift(dL, dR, TRACK, x, y, yaw, 0.0)
+    assert d["max_pos"] < 1e-9
+    assert d["max_yaw"] < 1e-9
+    assert d["worst_frames"] == []
+
+def test_track_mismatch_drifts():
+    x, y, yaw = _arc()
+    dL, dR = _wheel_arcs(x, y, yaw, TRACK)
+    d = core_math.odometry_drift(dL, dR, 2.0 * TRACK, x, y, yaw, 0.0, f0=1)
+    assert d["max_yaw"] > 1.0
+    assert d["max_pos"] > 0.5
+    assert d["worst_frames"] and all(1 < f <= len(x) for f in d["worst_frames"])
+
+def test_sign_flip_drifts():
+    x, y, yaw = _arc()
+    dL, dR = _wheel_arcs(x, y, yaw, TRACK)
+    d = core_math.odometry_drift(-dL, dR, TRACK, x, y, yaw, 0.0)
+    assert d["max_pos"] > 0.5
+    assert d["rms_yaw"] > 0.1
+
+# ---- measured geometry: θ built from the settings, wheels measured from the "scene" ----
+FPS, V, W = 50.0, 0.5, 0.4
+REAL_HALF, REAL_R = 0.125, 0.06
+
+def _analytic_arc(n=2000):
+    t = np.arange(n) / FPS
+    yaw = W * t
+    return t, V / W * np.sin(yaw), V / W * (1.0 - np.cos(yaw)), yaw
+
+def _driven_theta(t, side, track=2 * REAL_HALF, radius=REAL_R, sign=1.0):
+    # what build_cache drives a wheel with for given settings (constant-curvature arc)
+    half = 0.5 * track
+    v = V - W * half if side == 'L' else V + W * half
+    return sign * v * t / radius
+
+def _measured(t, **settings):
+    # two wheels per side at the real geometry, axes pointing left (roll +1)
+    wheels = []
+    for side, b in (('L', REAL_HALF), ('R', -REAL_HALF)):
+        for _ in range(2):
+            wheels.append((_driven_theta(t, side, **settings.get(side, {})), b, 1.0, REAL_R, side))
+    return wheels
+
+def test_measured_matching_settings_has_no_drift():
+    t, x, y, yaw = _analytic_arc()
+    d = core_math.measured_odometry(_measured(t), x, y, yaw, 0.0)
+    assert abs(d["track"] - 2 * REAL_HALF) < 1e-12
+    assert d["max_pos"] < 1e-5
+    assert d["worst_frames"] == []
+
+def test_measured_wrong_settings_drift():
+    t, x, y, yaw = _analytic_arc()
+    for bad in ({"track": 0.5}, {"radius": 0.05}, {"sign": -1.0}):
+        d = core_math.measured_odometry(_measured(t, L=bad, R=bad if "sign" not in bad else {}), x, y, yaw, 0.0)
+        assert d["max_pos"] > 0.05, bad
+
+def test_centre_line_wheel_uses_side_label():
+    t, x, y, yaw = _analytic_arc()
+    wheels = _measured(t) + [(_driven_theta(t, 'L'), 0.0, 1.0, REAL_R, 'L')]
+    d = core_math.measured_odometry(wheels, x, y, yaw, 0.0)
+    assert abs(d["track"] - 2 * REAL_HALF) < 1e-12
+    assert d["max_pos"] < 1e-5
+
+def test_missing_side_returns_none():
+    t, x, y, yaw = _analytic_arc()
+    wheels = [w for w in _measured(t) if w[4] == 'L']
+    assert core_math.measured_odometry(wheels, x, y, yaw, 0.0) is None
+
+def test_swapped_sides_drift():
+    # swap_lr wrong: each physical side is driven with the other side's θ
+    t, x, y, yaw = _analytic_arc()
+    wheels = [(_driven_theta(t, 'R' if side == 'L' else 'L'), b, roll, r, side)
+              for _, b, roll, r, side in _measured(t)]
+    d = core_math.measured_odometry(wheels, x, y, yaw, 0.0)
+    assert d["max_yaw"] > 1.0